@@ -2,22 +2,32 @@
 
 from __future__ import annotations
 
-import json
 import os
+import select
+import shutil
 import signal
 import time
-from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Deque, Optional, Tuple
+from typing import Dict, Optional, Set, Tuple
+
+import numpy as np
 
 from bme280 import BME280
 
+CSV_HEADER = b"timestamp,epoch,temperature_c,pressure_hpa,humidity_rh\n"
+
+LIVE_TEMPLATE = (
+    b'{"timestamp": "%s", "epoch": %d, '
+    b'"temperature_c": %.3f, "pressure_hpa": %.3f, "humidity_rh": %.3f}'
+)
+
 
 @dataclass
 class Config:
     sample_hz: int = 50
+    live_hz: int = 10
     window_samples: int = 50
     store_interval_s: int = 60
     i2c_bus: int = 1
@@ -26,24 +36,48 @@ class Config:
     backup_dir: Path = Path("data/BU")
     live_file: Path = Path("data/live.json")
     freeze_on_error: bool = True
+    durable_backup: bool = False
 
 
-class MovingAverage:
-    def __init__(self, window: int) -> None:
-        self.window = window
-        self.buffer: Deque[float] = deque(maxlen=window)
-        self.sum = 0.0
+class ChannelBuffer:
+    """Moving average over (temperature, pressure, humidity) sharing one ring index."""
 
-    def add(self, value: float) -> None:
-        if len(self.buffer) == self.window:
-            self.sum -= self.buffer[0]
-        self.buffer.append(value)
-        self.sum += value
+    CHANNELS = 3
 
-    def mean(self) -> Optional[float]:
-        if not self.buffer:
+    def __init__(self, window: int) -> None:
+        self.window = window
+        # Cache-line (64 byte) aligned view into a slightly larger allocation;
+        # _raw keeps the backing memory alive. Micro-optimisation only: a
+        # 24-byte row can still straddle a line boundary.
+        size = window * self.CHANNELS
+        self._raw = np.empty(size + 8, dtype=np.float64)
+        offset = (-self._raw.ctypes.data % 64) // self._raw.itemsize
+        self.buf = self._raw[offset : offset + size].reshape(window, self.CHANNELS)
+        self.buf[:] = 0.0
+        self.idx = 0
+        self.count = 0
+        self.sum = np.zeros(self.CHANNELS, dtype=np.float64)
+
+    def add(self, values: Tuple[float, float, float]) -> None:
+        row = self.buf[self.idx]
+        if self.count == self.window:
+            self.sum -= row
+        else:
+            self.count += 1
+        row[:] = values
+        self.sum += row
+        self.idx = (self.idx + 1) % self.window
+
+    def clear(self) -> None:
+        self.buf[:] = 0.0
+        self.sum[:] = 0.0
+        self.idx = 0
+        self.count = 0
+
+    def mean(self) -> Optional[Tuple[float, float, float]]:
+        if self.count == 0:
             return None
-        return self.sum / len(self.buffer)
+        return tuple((self.sum / self.count).tolist())
 
 
 class EnvLogger:
@@ -51,24 +85,40 @@ class EnvLogger:
         self.config = config
         self.keep_running = True
         self.sensor = BME280(bus_id=config.i2c_bus, address=config.i2c_address)
-        self.temp_avg = MovingAverage(config.window_samples)
-        self.press_avg = MovingAverage(config.window_samples)
-        self.hum_avg = MovingAverage(config.window_samples)
+        self.avg = ChannelBuffer(config.window_samples)
         self.last_success_minute: Optional[int] = None
         self.last_saved_minute: Optional[int] = None
+        self._live_period_ns = 1_000_000_000 // config.live_hz
+        self._next_live_ns = 0
+        self._live_tmp = config.live_file.with_suffix(".tmp")
+        self._csv_fds: Dict[str, int] = {}
+        self._linked_backups: Dict[str, bool] = {}
+        self._durable_prepared: Set[str] = set()
+        self._csv_month: Optional[Tuple[int, int]] = None
+        self._csv_paths: Tuple[Tuple[str, str], ...] = ()
+        self._dt_cache: Tuple[int, datetime, str] = (
+            -1,
+            datetime.fromtimestamp(0, tz=timezone.utc),
+            "",
+        )
 
-    def run(self) -> None:
+    def run(self, wakeup_fd: Optional[int] = None) -> None:
+        """Sample until stopped; a readable ``wakeup_fd`` cuts the sleep short."""
         self._prepare_dirs()
-        period = 1.0 / self.config.sample_hz
-        next_tick = time.monotonic()
+        period_ns = 1_000_000_000 // self.config.sample_hz
+        next_tick_ns = time.perf_counter_ns()
 
         while self.keep_running:
-            next_tick += period
+            next_tick_ns += period_ns
             self._tick()
-            sleep_time = next_tick - time.monotonic()
-            if sleep_time > 0:
-                time.sleep(sleep_time)
-
+            sleep_ns = next_tick_ns - time.perf_counter_ns()
+            if sleep_ns > 0:
+                if wakeup_fd is None:
+                    time.sleep(sleep_ns / 1e9)
+                elif select.select([wakeup_fd], [], [], sleep_ns / 1e9)[0]:
+                    os.read(wakeup_fd, 512)
+
+        self._close_csv_fds()
         self.sensor.close()
 
     def stop(self) -> None:
@@ -84,20 +134,27 @@ class EnvLogger:
         had_success = False
 
         try:
-            temperature, pressure, humidity = self.sensor.read_compensated()
-            self.temp_avg.add(temperature)
-            self.press_avg.add(pressure)
-            self.hum_avg.add(humidity)
-            self.last_success_minute = minute
-            had_success = True
+            reading = self.sensor.read_compensated()
         except Exception:
+            # Transient I2C errors come back as None; anything raised here is
+            # unexpected but still handled like a failed sample.
+            reading = None
+
+        if reading is None:
             if not self.config.freeze_on_error:
-                self.temp_avg = MovingAverage(self.config.window_samples)
-                self.press_avg = MovingAverage(self.config.window_samples)
-                self.hum_avg = MovingAverage(self.config.window_samples)
+                self.avg.clear()
+        else:
+            self.avg.add(reading)
+            self.last_success_minute = minute
+            had_success = True
 
         if had_success:
-            self._write_live(now)
+            now_ns = time.perf_counter_ns()
+            if now_ns >= self._next_live_ns:
+                self._write_live(now)
+                self._next_live_ns += self._live_period_ns
+                if self._next_live_ns <= now_ns:
+                    self._next_live_ns = now_ns + self._live_period_ns
 
         if minute != self.last_saved_minute:
             self.last_saved_minute = minute
@@ -108,25 +165,43 @@ class EnvLogger:
         payload = self._current_payload(now)
         if payload is None:
             return
-        tmp_path = self.config.live_file.with_suffix(".tmp")
-        with tmp_path.open("w", encoding="utf-8") as handle:
-            json.dump(payload, handle, ensure_ascii=False)
-        os.replace(tmp_path, self.config.live_file)
+        data = LIVE_TEMPLATE % (
+            payload["timestamp"].encode("ascii"),
+            payload["epoch"],
+            payload["temperature_c"],
+            payload["pressure_hpa"],
+            payload["humidity_rh"],
+        )
+        fd = os.open(self._live_tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+        os.replace(self._live_tmp, self.config.live_file)
 
     def _current_payload(self, now: float) -> Optional[dict]:
-        temperature = self.temp_avg.mean()
-        pressure = self.press_avg.mean()
-        humidity = self.hum_avg.mean()
-        if temperature is None or pressure is None or humidity is None:
+        means = self.avg.mean()
+        if means is None:
             return None
+        temperature, pressure, humidity = means
+        sec = int(now)
+        _, timestamp = self._utc(sec)
         return {
-            "timestamp": datetime.fromtimestamp(now, tz=timezone.utc).isoformat(),
-            "epoch": int(now),
-            "temperature_c": round(temperature, 3),
-            "pressure_hpa": round(pressure, 3),
-            "humidity_rh": round(humidity, 3),
+            "timestamp": timestamp,
+            "epoch": sec,
+            "temperature_c": temperature,
+            "pressure_hpa": pressure,
+            "humidity_rh": humidity,
         }
 
+    def _utc(self, sec: int) -> Tuple[datetime, str]:
+        # The live payload and the minute row share one datetime per second.
+        if sec != self._dt_cache[0]:
+            dt = datetime.fromtimestamp(sec, tz=timezone.utc)
+            self._dt_cache = (sec, dt, dt.isoformat())
+        _, dt, timestamp = self._dt_cache
+        return dt, timestamp
+
     def _write_minute_row(self, now: float) -> None:
         payload = self._current_payload(now)
         if payload is None:
@@ -138,29 +213,104 @@ class EnvLogger:
             f"{timestamp},{epoch},"
             f"{payload['temperature_c']:.3f},"
             f"{payload['pressure_hpa']:.3f},"
-            f"{payload['humidity_rh']:.3f}"
+            f"{payload['humidity_rh']:.3f}\n"
+        ).encode("ascii")
+
+        dt, _ = self._utc(epoch)
+        if (dt.year, dt.month) != self._csv_month:
+            self._close_csv_fds()
+            self._csv_month = (dt.year, dt.month)
+            self._csv_paths = self._csv_paths_for(dt)
+
+        for path, backup in self._csv_paths:
+            if self.config.durable_backup:
+                self._prepare_durable_backup(path, backup)
+                self._append_csv(path, row)
+                self._append_csv(backup, row, durable=True)
+                continue
+            self._append_csv(path, row)
+            if not self._backup_linked(path, backup):
+                self._append_csv(backup, row)
+
+    def _csv_paths_for(self, dt: datetime) -> Tuple[Tuple[str, str], ...]:
+        data_dir = self.config.data_dir
+        backup_dir = self.config.backup_dir
+        return (
+            (str(data_dir / f"{dt.year}.csv"), str(backup_dir / f"{dt.year}_bu.csv")),
+            (
+                str(data_dir / f"{dt.year}_{dt.month:02d}.csv"),
+                str(backup_dir / f"{dt.year}_{dt.month:02d}_bu.csv"),
+            ),
         )
 
-        dt = datetime.fromtimestamp(now, tz=timezone.utc)
-        year_name = f"{dt.year}.csv"
-        month_name = f"{dt.year}_{dt.month:02d}.csv"
-
-        primary_year = self.config.data_dir / year_name
-        primary_month = self.config.data_dir / month_name
-        backup_year = self.config.backup_dir / f"{dt.year}_bu.csv"
-        backup_month = self.config.backup_dir / f"{dt.year}_{dt.month:02d}_bu.csv"
-
-        header = "timestamp,epoch,temperature_c,pressure_hpa,humidity_rh"
-        for path in (primary_year, primary_month, backup_year, backup_month):
-            self._append_csv(path, header, row)
-
-    @staticmethod
-    def _append_csv(path: Path, header: str, row: str) -> None:
-        needs_header = not path.exists() or path.stat().st_size == 0
-        with path.open("a", encoding="utf-8") as handle:
-            if needs_header:
-                handle.write(f"{header}\n")
-            handle.write(f"{row}\n")
+    def _append_csv(self, path: str, row: bytes, durable: bool = False) -> None:
+        fd = self._csv_fds.get(path)
+        if fd is None:
+            flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND
+            created = False
+            if durable:
+                flags |= os.O_DSYNC
+                created = not os.path.exists(path)
+            fd = os.open(path, flags, 0o644)
+            if os.fstat(fd).st_size == 0:
+                os.write(fd, CSV_HEADER)
+            if created:
+                self._fsync_backup_dir()
+            self._csv_fds[path] = fd
+        os.write(fd, row)
+
+    def _prepare_durable_backup(self, path: str, backup: str) -> None:
+        # With durable_backup the backup must be its own inode. A hard link
+        # left by a non-durable run, or a missing backup, is replaced by a
+        # synced copy of the primary before new rows are appended to both.
+        if path in self._durable_prepared:
+            return
+        if os.path.exists(path) and (
+            not os.path.exists(backup) or os.path.samefile(path, backup)
+        ):
+            tmp = f"{backup}.tmp"
+            shutil.copyfile(path, tmp)
+            fd = os.open(tmp, os.O_WRONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            os.replace(tmp, backup)
+            self._fsync_backup_dir()
+        self._durable_prepared.add(path)
+
+    def _fsync_backup_dir(self) -> None:
+        # O_DSYNC and fsync() on a file do not persist its directory entry;
+        # newly created or replaced backups need the directory synced too.
+        fd = os.open(self.config.backup_dir, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _backup_linked(self, path: str, backup: str) -> bool:
+        # Backups are hard links to the primary file where possible, so each
+        # row is written once. Falls back to a separate copy if the backup
+        # already exists as its own file or lives on another filesystem.
+        linked = self._linked_backups.get(path)
+        if linked is None:
+            if os.path.exists(backup):
+                linked = os.path.samefile(path, backup)
+            else:
+                try:
+                    os.link(path, backup)
+                    linked = True
+                except OSError:
+                    linked = False
+            self._linked_backups[path] = linked
+        return linked
+
+    def _close_csv_fds(self) -> None:
+        for fd in self._csv_fds.values():
+            os.close(fd)
+        self._csv_fds.clear()
+        self._linked_backups.clear()
+        self._durable_prepared.clear()
 
 
 def main() -> None:
@@ -169,10 +319,15 @@ def main() -> None:
     def handle_signal(_: int, __: object) -> None:
         logger.stop()
 
+    # Signals write to the pipe, so the select() in run() wakes immediately.
+    wakeup_r, wakeup_w = os.pipe()
+    os.set_blocking(wakeup_w, False)
+    signal.set_wakeup_fd(wakeup_w)
+
     signal.signal(signal.SIGINT, handle_signal)
     signal.signal(signal.SIGTERM, handle_signal)
 
-    logger.run()
+    logger.run(wakeup_fd=wakeup_r)
 
 
 if __name__ == "__main__":